@@ -44,7 +44,6 @@ class CommandExecutor:
 
         if config.enable_ignore:
             controller = IgnoreController(config.cwd or Path.cwd(), shell=config.shell_policy)
-            controller.load()
             blocked = controller.validate_command(config.command)
             if blocked:
                 return CommandResult(
@@ -9,7 +9,7 @@ from path_tree_graph import PathTree, PathTreeNode, TreeGraph
 from .utils.ext_patterns import EXT_PATTERNS_FOR_BASE_EXCLUDE
 
 
-@dataclass
+@dataclass(slots=True)
 class LineMeta:
     """
     Represents a single line match in a file.
@@ -21,7 +21,7 @@ class LineMeta:
     line: int
     text: str
 
-@dataclass
+@dataclass(slots=True)
 class FileMatchMeta:
     """
     Represents a file with search matches.
@@ -145,25 +145,26 @@ class PathTreeForSearchTool(PathTree):
         if node is None:
             node = self.root
 
-        # Build the tree line
-        tree_symbol = "└── " if prefix else ""
-        formatted_str = prefix + tree_symbol + node.name + "\n"
-
-        if not only_filename and node.is_leaf and node.meta:
-            formatted_str += node.meta.format_matches(
-                prefix + " " * len(tree_symbol),
-                max_matches_per_file,
-            )
-
-        children = sorted(node.children.values(), key=lambda x: x.name)
-        for i, child in enumerate(children):
-            formatted_str += self.format(
-                child,
-                prefix + "    ",
-                only_filename,
-                max_matches_per_file,
-            )
-        return formatted_str
+        # Walk depth-first with an explicit stack so deep trees cannot hit the recursion limit
+        formatted_parts = []
+        stack = [(node, prefix)]
+        while stack:
+            node, prefix = stack.pop()
+
+            # Build the tree line
+            tree_symbol = "└── " if prefix else ""
+            formatted_parts.append(prefix + tree_symbol + node.name + "\n")
+
+            if not only_filename and node.is_leaf and node.meta:
+                formatted_parts.append(node.meta.format_matches(
+                    prefix + " " * len(tree_symbol),
+                    max_matches_per_file,
+                ))
+
+            # Push in reverse so children pop in sorted order
+            children = sorted(node.children.values(), key=lambda x: x.name)
+            stack.extend((child, prefix + "    ") for child in reversed(children))
+        return "".join(formatted_parts)
 
 class TreeGraphForSearchTool(TreeGraph):
     """
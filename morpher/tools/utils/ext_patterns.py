@@ -1,4 +1,5 @@
 import os
+import re
 from pathlib import Path
 from typing import List
 
@@ -213,6 +214,9 @@ EXT_PATTERNS_FOR_BASE_EXCLUDE = [
     *EXT_PATTERNS_FOR_LOG_FILE,
 ]
 
+# Matches a .gitattributes line routed through LFS, capturing its path pattern
+_LFS_ATTRIBUTE_RE = re.compile(r"^\s*(\S+)\s+[^\n]*\bfilter=lfs\b")
+
 
 def get_lfs_patterns(workspace_path: str) -> List[str]:
     """Get Git LFS file patterns"""
@@ -221,14 +225,12 @@ def get_lfs_patterns(workspace_path: str) -> List[str]:
         
         if attributes_path.exists():
             with open(attributes_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                lines = content.split("\n")
                 lfs_patterns = []
                 
-                for line in lines:
-                    if "filter=lfs" in line:
-                        pattern = line.split(" ")[0].strip()
-                        lfs_patterns.append(pattern)
+                for line in f:
+                    match = _LFS_ATTRIBUTE_RE.match(line)
+                    if match:
+                        lfs_patterns.append(match.group(1))
                 
                 return lfs_patterns
     except Exception:
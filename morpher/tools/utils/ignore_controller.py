@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import fnmatch
+import os
+import re
 import shlex
 from abc import ABC, abstractmethod
 from pathlib import Path
@@ -10,10 +12,21 @@ from typing import Optional, Iterable, List
 IGNORE_FILENAME = ".morpherignore"
 
 
+def _pattern_to_line_regex(pat: str) -> str:
+    """Regex source matching one whole line of a newline-joined batch, mirroring _matches."""
+    anchor = pat.lstrip("/")
+    # Directory pattern
+    if pat.endswith("/"):
+        return f"{re.escape(anchor.rstrip('/'))}|{re.escape(anchor)}.*"
+    # File pattern or glob: drop translate()'s (?s:...)\Z wrapper so '.' stops at newlines
+    translated = fnmatch.translate(anchor)
+    return translated[len("(?s:"):translated.rindex(")")]
+
+
 class CommandPolicy(ABC):
     @property
     @abstractmethod
-    def file_reading_commands(self) -> set[str]:
+    def file_reading_commands(self) -> frozenset[str]:
         ...
 
     @abstractmethod
@@ -26,9 +39,11 @@ class CommandPolicy(ABC):
 
 
 class UnixPolicy(CommandPolicy):
+    FILE_READING_COMMANDS = frozenset({"cat", "less", "more", "head", "tail", "grep", "awk", "sed"})
+
     @property
-    def file_reading_commands(self) -> set[str]:
-        return {"cat", "less", "more", "head", "tail", "grep", "awk", "sed"}
+    def file_reading_commands(self) -> frozenset[str]:
+        return self.FILE_READING_COMMANDS
 
     def tokenize(self, command: str) -> List[str]:
         return shlex.split(command, posix=True)
@@ -41,9 +56,11 @@ class UnixPolicy(CommandPolicy):
 
 
 class PowerShellPolicy(CommandPolicy):
+    FILE_READING_COMMANDS = frozenset({"get-content", "gc", "type", "select-string", "sls"})
+
     @property
-    def file_reading_commands(self) -> set[str]:
-        return {"get-content", "gc", "type", "select-string", "sls"}
+    def file_reading_commands(self) -> frozenset[str]:
+        return self.FILE_READING_COMMANDS
 
     def tokenize(self, command: str) -> List[str]:
         # posix=False to keep PowerShell-like quoting behavior
@@ -87,9 +104,15 @@ class ShellPolicyFactory:
 class IgnoreController:
     def __init__(self, cwd: str | Path, shell: str = "auto"):
         self.cwd = Path(cwd).resolve()
+        cwd_str = str(self.cwd)
+        self._cwd_prefix = cwd_str if cwd_str.endswith(os.sep) else cwd_str + os.sep
         self.policy = ShellPolicyFactory.create_policy(shell)
         self._patterns: List[str] = []
-        self._loaded = False
+        self._dir_anchors: tuple[str, ...] = ()
+        self._dir_exact: frozenset[str] = frozenset()
+        self._file_patterns: List[re.Pattern] = []
+        self._combined_re: Optional[re.Pattern] = None
+        self.load()
 
     def load(self) -> None:
         p = self.cwd / IGNORE_FILENAME
@@ -100,41 +123,92 @@ class IgnoreController:
                 if not line or line.startswith("#"):
                     continue
                 self._patterns.append(line)
-        self._loaded = True
-
-    def _ensure_loaded(self) -> None:
-        if not self._loaded:
-            self.load()
+        self._dir_anchors = tuple(pat.lstrip("/") for pat in self._patterns if pat.endswith("/"))
+        self._dir_exact = frozenset(anchor.rstrip("/") for anchor in self._dir_anchors)
+        # Translate globs once here rather than through fnmatch on every _matches call
+        self._file_patterns = [
+            re.compile(fnmatch.translate(os.path.normcase(pat.lstrip("/"))))
+            for pat in self._patterns if not pat.endswith("/")
+        ]
+        self._combined_re = None
+        if self._patterns:
+            alternatives = "|".join(f"(?:{_pattern_to_line_regex(pat)})" for pat in self._patterns)
+            self._combined_re = re.compile(f"^(?:{alternatives})$", re.MULTILINE)
 
     def _matches(self, rel_posix: str) -> bool:
-        for pat in self._patterns:
-            # Directory pattern
-            if pat.endswith("/"):
-                anchor = pat.lstrip("/")
-                if rel_posix == anchor.rstrip("/") or rel_posix.startswith(anchor):
-                    return True
-                continue
-            # File pattern or glob
-            anchor = pat.lstrip("/")
-            if fnmatch.fnmatch(rel_posix, anchor):
+        # Directory patterns: one set lookup plus one tuple startswith
+        if rel_posix in self._dir_exact or rel_posix.startswith(self._dir_anchors):
+            return True
+        # File patterns or globs (normcase keeps fnmatch.fnmatch semantics)
+        rel_norm = os.path.normcase(rel_posix)
+        for file_re in self._file_patterns:
+            if file_re.match(rel_norm):
                 return True
         return False
 
+    def _relative_posix(self, rel_path: str) -> Optional[str]:
+        """Path relative to cwd in posix form, or None if it lies outside cwd."""
+        # realpath (like resolve()) follows symlinks, so a link pointing into an
+        # ignored directory is matched under its target; a purely lexical
+        # normpath would let "link/key" slip past "secrets/"
+        real = os.path.realpath(os.path.join(self.cwd, rel_path))
+        if real.startswith(self._cwd_prefix):
+            return real[len(self._cwd_prefix):].replace(os.sep, "/")
+        if real == str(self.cwd):
+            return "."
+        return None
+
     def validate_access(self, rel_path: str) -> bool:
         """True if allowed, False if ignored."""
-        self._ensure_loaded()
         if not self._patterns:
             return True
-        try:
-            abs_path = (self.cwd / rel_path).resolve()
-            rel = abs_path.relative_to(self.cwd).as_posix()
-        except Exception:
+        rel = self._relative_posix(rel_path)
+        if rel is None:
             # Outside cwd: allow
             return True
         return not self._matches(rel)
 
+    def validate_access_batch(self, rel_paths: Iterable[str]) -> List[bool]:
+        """validate_access for many paths, matched in a single regex scan."""
+        rel_paths = list(rel_paths)
+        allowed = [True] * len(rel_paths)
+        if not self._patterns:
+            return allowed
+
+        lines: List[str] = []
+        line_owner = {}  # line start offset -> index into rel_paths
+        offset = 0
+        for i, rel_path in enumerate(rel_paths):
+            rel = self._relative_posix(rel_path)
+            if rel is None:
+                continue  # Outside cwd: allow
+            if "\n" in rel:
+                allowed[i] = not self._matches(rel)
+                continue
+            line_owner[offset] = i
+            lines.append(rel)
+            offset += len(rel) + 1
+
+        text = "\n".join(lines)
+        pos = 0
+        while True:
+            match = self._combined_re.search(text, pos)
+            if match is None:
+                break
+            start = match.start()
+            line_end = text.find("\n", start)
+            if line_end == -1:
+                line_end = len(text)
+            if match.end() == line_end:
+                allowed[line_owner[start]] = False
+            else:
+                # A negated class ([!x] -> [^x]) ran across the newline into the
+                # next path; decide this line on its own and resume after it
+                allowed[line_owner[start]] = not self._matches(text[start:line_end])
+            pos = line_end + 1
+        return allowed
+
     def validate_command(self, command: str) -> Optional[str]:
-        self._ensure_loaded()
         if not self._patterns:
             return None
         parts = self.policy.tokenize(command)
@@ -1,12 +1,107 @@
+import codecs
+import functools
+import io
+import mmap
 import os
+import re
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import List, Optional, Union, Dict
 import tempfile
 import shutil
+import secrets
+import stat
+import sys
+from collections import OrderedDict
 import difflib
 
+try:
+    from diff_match_patch import diff_match_patch
+except ImportError:  # Optional: large diffs fall back to difflib
+    diff_match_patch = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: the O_DIRECT apply path is Linux-only anyway
+    fcntl = None
+
+# Above this size difflib's quadratic matcher dominates; switch to Myers O(ND)
+LARGE_DIFF_BYTES = 64 * 1024
+LARGE_DIFF_LINES = 2000
+
+# O_DIRECT apply path (WriteConfig.fast_large_write): minimum size and staging block
+DIRECT_WRITE_THRESHOLD = 1 << 20
+DIRECT_WRITE_BLOCK = 1 << 20
+
+# Recently read files keyed by (abspath, encoding, ino, mtime_ns, ctime_ns, size); lets apply reuse
+# the preview's read. ino catches files replaced by rename, ctime writes that restore the mtime;
+# neither separates two same-size writes inside one timestamp tick
+_FILE_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+_FILE_CACHE_MAX_ENTRIES = 8
+_FILE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_file_cache_bytes = 0
+
+# Identity checks on files up to this size read through the cache; larger ones stream
+IDENTITY_CACHED_READ_BYTES = 1024 * 1024
+
+_CRLF_RE = re.compile(r'\r\n?')
+# Lines split on '\n' only, each keeping its terminator (the last one may lack it)
+_LINE_RE = re.compile(r'[^\n]*\n|[^\n]+')
+
+
+def _normalize_newlines(text: str) -> str:
+    """Normalize CRLF and lone CR line endings to LF in a single pass"""
+    if '\r' not in text:
+        return text
+    return _CRLF_RE.sub('\n', text)
+
+
+@functools.lru_cache(maxsize=1)
+def _resolved_cwd(cwd: str) -> str:
+    """Resolved working directory, recomputed only when os.getcwd() changes"""
+    return str(Path(cwd).resolve())
+
+
+def _cache_file_content(key: tuple, content: str):
+    """Store content in the LRU file cache, evicting oldest entries over the caps"""
+    global _file_cache_bytes
+    # Charge real memory: a str holding non-Latin-1 text takes 2-4 bytes per char
+    size = sys.getsizeof(content)
+    if size > _FILE_CACHE_MAX_BYTES:
+        return
+    previous = _FILE_CACHE.pop(key, None)
+    if previous is not None:
+        _file_cache_bytes -= sys.getsizeof(previous)
+    _FILE_CACHE[key] = content
+    _file_cache_bytes += size
+    while len(_FILE_CACHE) > _FILE_CACHE_MAX_ENTRIES or _file_cache_bytes > _FILE_CACHE_MAX_BYTES:
+        _, evicted = _FILE_CACHE.popitem(last=False)
+        _file_cache_bytes -= sys.getsizeof(evicted)
+
+
+def _invalidate_file_cache(file_path: Path):
+    """Drop every cached read of file_path"""
+    global _file_cache_bytes
+    abspath = os.path.abspath(file_path)
+    for key in [key for key in _FILE_CACHE if key[0] == abspath]:
+        _file_cache_bytes -= sys.getsizeof(_FILE_CACHE.pop(key))
+
+
+def _read_file_cached(file_path: Path, encoding: str, st: os.stat_result) -> str:
+    """Read file_path as text through the LRU file cache; st must be a fresh stat of it"""
+    key = (os.path.abspath(file_path), encoding,
+           st.st_ino, st.st_mtime_ns, st.st_ctime_ns, st.st_size)
+    content = _FILE_CACHE.get(key)
+    if content is not None:
+        _FILE_CACHE.move_to_end(key)
+        return content
+
+    with open(file_path, 'r', encoding=encoding) as f:
+        content = f.read()
+    _cache_file_content(key, content)
+    return content
+
 
 class OutputStyle(Enum):
     """Output formatting styles"""
@@ -29,21 +124,31 @@ class WriteOperation(Enum):
     PREPEND = "prepend"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FileChange:
     """Represents a file change operation"""
     file_path: Path
     original_content: str
     new_content: str
     operation: WriteOperation
+    _line_count: int = field(init=False, repr=False, compare=False)
+    _has_changes: bool = field(init=False, repr=False, compare=False)
+    _is_new_file: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Inputs are fixed, so derive everything once: str.count scans in C without a
+        # list of lines, the content compare and the exists() stat happen a single time
+        object.__setattr__(self, '_line_count', self.new_content.count('\n') + 1)
+        object.__setattr__(self, '_has_changes', self.original_content != self.new_content)
+        object.__setattr__(self, '_is_new_file', not self.file_path.exists())
 
     @property
     def has_changes(self) -> bool:
-        return self.original_content != self.new_content
+        return self._has_changes
 
     @property
     def is_new_file(self) -> bool:
-        return not self.file_path.exists()
+        return self._is_new_file
 
     @property
     def content_size(self) -> int:
@@ -51,10 +156,10 @@ class FileChange:
 
     @property
     def line_count(self) -> int:
-        return len(self.new_content.split('\n'))
+        return self._line_count
 
 
-@dataclass
+@dataclass(slots=True)
 class FileResult:
     """Results for a single file operation"""
     file_path: Path
@@ -82,7 +187,7 @@ class FileResult:
         return "modified"
 
 
-@dataclass
+@dataclass(slots=True)
 class WriteConfig:
     """Configuration for write operation"""
     content: str
@@ -92,18 +197,33 @@ class WriteConfig:
     backup: bool = True
     create_dirs: bool = True
     preserve_permissions: bool = True
+    fast_large_write: bool = False
 
     def __post_init__(self):
         self.file_path = Path(self.file_path)
         # Normalize content line endings
-        self.content = self.content.replace('\r\n', '\n').replace('\r', '\n')
+        self.content = _normalize_newlines(self.content)
 
 
-@dataclass
+@dataclass(slots=True)
 class WriteResult:
     """Complete write operation results"""
     config: WriteConfig
     file_results: List[FileResult] = field(default_factory=list)
+    # Per-result flags captured once, so aggregates don't re-compare contents or re-stat files
+    _has_change_flags: bytearray = field(default_factory=bytearray, init=False, repr=False, compare=False)
+    _is_new_flags: bytearray = field(default_factory=bytearray, init=False, repr=False, compare=False)
+
+    def add_result(self, file_result: FileResult):
+        """Append a file result and record its aggregate flags"""
+        self.file_results.append(file_result)
+        self._sync_flags()
+
+    def _sync_flags(self):
+        # Also picks up results appended to file_results directly
+        for fr in self.file_results[len(self._has_change_flags):]:
+            self._has_change_flags.append(fr.has_change)
+            self._is_new_flags.append(fr.change is not None and fr.change.is_new_file)
 
     @property
     def total_files_processed(self) -> int:
@@ -111,14 +231,17 @@ class WriteResult:
 
     @property
     def total_files_changed(self) -> int:
-        return sum(1 for fr in self.file_results if fr.has_change)
+        self._sync_flags()
+        return sum(self._has_change_flags)
 
     @property
     def total_files_created(self) -> int:
-        return sum(1 for fr in self.file_results if fr.change and fr.change.is_new_file)
+        self._sync_flags()
+        return sum(self._is_new_flags)
 
     @property
     def success(self) -> bool:
+        # Success is set after a result is added, so it is read live
         return all(fr.success for fr in self.file_results)
 
 
@@ -148,10 +271,12 @@ class FileProcessor:
     def _read_file_safely(self, file_path: Path) -> str:
         """Read file content safely"""
         try:
-            if file_path.exists():
-                with open(file_path, 'r', encoding=self.config.encoding) as f:
-                    return f.read()
-            return ""
+            try:
+                st = file_path.stat()
+            except FileNotFoundError:
+                return ""
+
+            return _read_file_cached(file_path, self.config.encoding, st)
         except Exception as e:
             print(f"Warning: Could not read {file_path}: {e}")
             return ""
@@ -179,9 +304,28 @@ class FileProcessor:
         return self.config.content
 
 
+class _OpcodeMatcher(difflib.SequenceMatcher):
+    """SequenceMatcher that serves precomputed opcodes, reusing difflib's hunk grouping"""
+
+    def __init__(self, opcodes: List[tuple]):
+        self._opcodes = opcodes
+
+    def get_opcodes(self) -> List[tuple]:
+        return self._opcodes
+
+
 class OutputFormatter:
     """Handles different output formatting styles"""
 
+    @staticmethod
+    def format_chunks(file_result: FileResult, style: OutputStyle) -> List[str]:
+        """Generate output for a style as pieces that concatenate to the formatted string"""
+        if style == OutputStyle.GIT_CONFLICT:
+            return OutputFormatter._git_conflict_chunks(file_result)
+        if style == OutputStyle.GIT_DIFF:
+            return [OutputFormatter.format_git_diff(file_result)]
+        return [OutputFormatter.format_default(file_result)]
+
     @staticmethod
     def format_default(file_result: FileResult) -> str:
         """Generate complete file content"""
@@ -196,64 +340,164 @@ class OutputFormatter:
             return ""
 
         change = file_result.change
-        output = []
+        # Lines are written with a leading separator so the result has no trailing newline
+        buf = io.StringIO()
 
         if change.is_new_file:
             # New file
-            output.append(f"diff --git a/{change.file_path} b/{change.file_path}")
-            output.append("new file mode 100644")
-            output.append("index 0000000..1111111")
-            output.append("--- /dev/null")
-            output.append(f"+++ b/{change.file_path}")
-
-            new_lines = change.new_content.split('\n')
-            output.append(f"@@ -0,0 +1,{len(new_lines)} @@")
-            for line in new_lines:
-                output.append(f"+{line}")
+            buf.write(f"diff --git a/{change.file_path} b/{change.file_path}\n")
+            buf.write("new file mode 100644\n")
+            buf.write("index 0000000..1111111\n")
+            buf.write("--- /dev/null\n")
+            buf.write(f"+++ b/{change.file_path}\n")
+
+            buf.write(f"@@ -0,0 +1,{change.line_count} @@\n+")
+            # str.replace counts matches first and allocates the '+'-prefixed body exactly once
+            buf.write(change.new_content.replace('\n', '\n+'))
         else:
             # Modified file - use difflib for better diff
-            output.append(f"diff --git a/{change.file_path} b/{change.file_path}")
-            output.append("index 0000000..1111111 100644")
-            output.append(f"--- a/{change.file_path}")
-            output.append(f"+++ b/{change.file_path}")
-
-            original_lines = change.original_content.split('\n')
-            new_lines = change.new_content.split('\n')
-
-            # Use difflib to generate unified diff
-            diff = difflib.unified_diff(
-                original_lines,
-                new_lines,
-                n=3,
-                lineterm=''
-            )
+            buf.write(f"diff --git a/{change.file_path} b/{change.file_path}\n")
+            buf.write("index 0000000..1111111 100644\n")
+            buf.write(f"--- a/{change.file_path}\n")
+            buf.write(f"+++ b/{change.file_path}\n")
+
+            # Keep terminators so diff lines can be written as-is
+            original_lines = _LINE_RE.findall(change.original_content)
+            new_lines = _LINE_RE.findall(change.new_content)
+
+            opcodes = None
+            if (max(len(change.original_content), len(change.new_content)) > LARGE_DIFF_BYTES or
+                max(len(original_lines), len(new_lines)) > LARGE_DIFF_LINES):
+                opcodes = OutputFormatter._myers_line_opcodes(original_lines, new_lines)
+
+            if opcodes is None:
+                # Use difflib to generate unified diff
+                opcodes = OutputFormatter._trimmed_opcodes(original_lines, new_lines)
 
-            # Skip the first two lines (file headers) as we already added them
-            diff_lines = list(diff)[2:]
-            output.extend(diff_lines)
+            OutputFormatter._write_unified_hunks(buf, original_lines, new_lines, opcodes)
 
-        return '\n'.join(output)
+            # Match the new-file branch: no newline after the last line
+            buf.truncate(buf.tell() - 1)
+
+        return buf.getvalue()
+
+    @staticmethod
+    def _trimmed_opcodes(original_lines: List[str], new_lines: List[str]) -> List[tuple]:
+        """difflib opcodes with the common prefix and suffix stripped before matching, as GNU diff does"""
+        limit = min(len(original_lines), len(new_lines))
+        prefix = 0
+        while prefix < limit and original_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and original_lines[-1 - suffix] == new_lines[-1 - suffix]:
+            suffix += 1
+        a_end, b_end = len(original_lines) - suffix, len(new_lines) - suffix
+
+        opcodes = []
+
+        def add(tag, i1, i2, j1, j2):
+            # Merge touching equal runs so hunk grouping sees one context block
+            if tag == 'equal' and opcodes and opcodes[-1][0] == 'equal':
+                _, i1, _, j1, _ = opcodes.pop()
+            opcodes.append((tag, i1, i2, j1, j2))
+
+        if prefix:
+            add('equal', 0, prefix, 0, prefix)
+        # SequenceMatcher is quadratic in the worst case; only feed it the changed region
+        matcher = difflib.SequenceMatcher(None, original_lines[prefix:a_end], new_lines[prefix:b_end])
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            add(tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+        if suffix:
+            add('equal', a_end, len(original_lines), b_end, len(new_lines))
+        return opcodes
+
+    @staticmethod
+    def _myers_line_opcodes(original_lines: List[str], new_lines: List[str]) -> Optional[List[tuple]]:
+        """Line-level opcodes from diff-match-patch, or None if it is unavailable"""
+        if diff_match_patch is None:
+            return None
+
+        dmp = diff_match_patch()
+        # dmp splits after each '\n' as well, so its lines align with ours one-to-one
+        chars1, chars2, line_array = dmp.diff_linesToChars(''.join(original_lines), ''.join(new_lines))
+        # dmp folds the remainder into one char once it runs out of code points
+        if len(chars1) != len(original_lines) or len(chars2) != len(new_lines):
+            return None
+
+        opcodes = []
+        i = j = 0
+        for op, text in dmp.diff_main(chars1, chars2, False):
+            n = len(text)  # one char per line
+            if op == diff_match_patch.DIFF_EQUAL:
+                opcodes.append(('equal', i, i + n, j, j + n))
+                i += n
+                j += n
+            elif op == diff_match_patch.DIFF_DELETE:
+                opcodes.append(('delete', i, i + n, j, j))
+                i += n
+            else:
+                opcodes.append(('insert', i, i, j, j + n))
+                j += n
+        return opcodes
+
+    @staticmethod
+    def _write_unified_hunks(buf: io.StringIO, original_lines: List[str], new_lines: List[str],
+                             opcodes: List[tuple], n: int = 3):
+        """Write unified diff hunks (without file headers) for precomputed opcodes into buf"""
+
+        def format_range(start, stop):
+            beginning, length = start + 1, stop - start
+            if length == 1:
+                return f"{beginning}"
+            if not length:
+                beginning -= 1
+            return f"{beginning},{length}"
+
+        def write_lines(marker, lines, start, stop):
+            # Marker and line are written separately: no per-line temporary string
+            for k in range(start, stop):
+                line = lines[k]
+                buf.write(marker)
+                buf.write(line)
+                if not line.endswith('\n'):
+                    buf.write('\n\\ No newline at end of file\n')
+
+        for group in _OpcodeMatcher(opcodes).get_grouped_opcodes(n):
+            first, last = group[0], group[-1]
+            buf.write(f"@@ -{format_range(first[1], last[2])} +{format_range(first[3], last[4])} @@\n")
+            for tag, i1, i2, j1, j2 in group:
+                if tag == 'equal':
+                    write_lines(' ', original_lines, i1, i2)
+                    continue
+                if tag in ('replace', 'delete'):
+                    write_lines('-', original_lines, i1, i2)
+                if tag in ('replace', 'insert'):
+                    write_lines('+', new_lines, j1, j2)
 
     @staticmethod
     def format_git_conflict(file_result: FileResult) -> str:
         """Generate git conflict style output for VS Code rendering"""
+        return ''.join(OutputFormatter._git_conflict_chunks(file_result))
+
+    @staticmethod
+    def _git_conflict_chunks(file_result: FileResult) -> List[str]:
+        """Git conflict output as pieces, so both sides are never copied into one string"""
         if not file_result.has_change:
-            return file_result.change.original_content if file_result.change else ""
+            return [file_result.change.original_content if file_result.change else ""]
 
         change = file_result.change
 
         if change.is_new_file:
-            return change.new_content
+            return [change.new_content]
 
         # Create conflict markers
-        conflict_content = []
-        conflict_content.append("<<<<<<< HEAD")
-        conflict_content.append(change.original_content)
-        conflict_content.append("=======")
-        conflict_content.append(change.new_content)
-        conflict_content.append(">>>>>>> incoming")
-
-        return '\n'.join(conflict_content)
+        return [
+            "<<<<<<< HEAD\n",
+            change.original_content,
+            "\n=======\n",
+            change.new_content,
+            "\n>>>>>>> incoming",
+        ]
 
 
 class SafetyValidator:
@@ -266,11 +510,13 @@ class SafetyValidator:
 
         # Check file path safety
         try:
-            file_path = config.file_path.resolve()
-            current_dir = Path.cwd().resolve()
+            current_dir = _resolved_cwd(os.getcwd())
+            # realpath follows symlinks like resolve() (a link to /etc must still warn);
+            # only the cwd resolution is cached
+            file_path = os.path.realpath(os.path.join(current_dir, config.file_path))
 
             # Warn if writing outside current directory tree
-            if not str(file_path).startswith(str(current_dir)):
+            if not file_path.startswith(current_dir):
                 warnings.append(f"Writing outside current directory: {file_path}")
         except Exception:
             warnings.append("Could not resolve file path")
@@ -284,12 +530,12 @@ class SafetyValidator:
             warnings.append(f"Large content size: {len(config.content) / 1024 / 1024:.1f}MB")
 
         # Check for many lines
-        line_count = len(config.content.split('\n'))
+        line_count = config.content.count('\n') + 1
         if line_count > 10000:
             warnings.append(f"Large line count: {line_count} lines")
 
-        # Check for binary content
-        if '\x00' in config.content:
+        # Check for binary content (str.find hits the memchr fast path on 1-byte-kind strings)
+        if config.content.find('\x00') != -1:
             warnings.append("Content contains null bytes (potential binary data)")
 
         return warnings
@@ -300,23 +546,52 @@ class SafetyValidator:
         warnings = []
 
         try:
-            if file_path.exists():
-                if not os.access(file_path, os.R_OK):
+            # One stat answers existence, readability and writability
+            try:
+                st = os.stat(file_path)
+            except (FileNotFoundError, NotADirectoryError):
+                st = None
+
+            if st is not None:
+                if not SafetyValidator._stat_allows(st, os.R_OK):
                     warnings.append(f"File not readable: {file_path}")
-                if not os.access(file_path, os.W_OK):
+                if not SafetyValidator._stat_allows(st, os.W_OK):
                     warnings.append(f"File not writable: {file_path}")
             else:
                 # Check parent directory
                 parent = file_path.parent
-                if not parent.exists():
+                try:
+                    parent_st = os.stat(parent)
+                except (FileNotFoundError, NotADirectoryError):
                     warnings.append(f"Parent directory does not exist: {parent}")
-                elif not os.access(parent, os.W_OK):
-                    warnings.append(f"Parent directory not writable: {parent}")
+                else:
+                    if not SafetyValidator._stat_allows(parent_st, os.W_OK):
+                        warnings.append(f"Parent directory not writable: {parent}")
         except Exception as e:
             warnings.append(f"Could not check file permissions: {e}")
 
         return warnings
 
+    @staticmethod
+    def _stat_allows(st: os.stat_result, mode: int) -> bool:
+        """os.access() for the effective user, answered from mode bits instead of a syscall"""
+        user_bit, group_bit, other_bit = (
+            (stat.S_IRUSR, stat.S_IRGRP, stat.S_IROTH) if mode == os.R_OK
+            else (stat.S_IWUSR, stat.S_IWGRP, stat.S_IWOTH)
+        )
+        if not hasattr(os, 'geteuid'):
+            # Windows: the owner bits mirror the read-only attribute, as os.access does
+            return bool(st.st_mode & user_bit)
+
+        euid = os.geteuid()
+        if euid == 0:
+            return True
+        if st.st_uid == euid:
+            return bool(st.st_mode & user_bit)
+        if st.st_gid == os.getegid() or st.st_gid in os.getgroups():
+            return bool(st.st_mode & group_bit)
+        return bool(st.st_mode & other_bit)
+
 
 class WriteEngine:
     """Main write file engine"""
@@ -376,9 +651,18 @@ class WriteEngine:
         result = WriteResult(config=config)
 
         try:
-            change = processor.prepare_change()
+            if self._needs_original_content(config, mode, output_style):
+                change = processor.prepare_change()
+            else:
+                # Nothing downstream looks at the old content, so skip reading it
+                change = FileChange(
+                    file_path=config.file_path,
+                    original_content="",
+                    new_content=config.content,
+                    operation=config.operation
+                )
             file_result = FileResult(file_path=config.file_path, change=change)
-            result.file_results.append(file_result)
+            result.add_result(file_result)
 
             # Handle output based on mode
             execution_mode = ExecutionMode(mode.lower())
@@ -395,11 +679,25 @@ class WriteEngine:
                 success=False, 
                 error_message=str(e)
             )
-            result.file_results.append(file_result)
+            result.add_result(file_result)
             print(f"❌ Error: {e}")
 
         return result
 
+    @staticmethod
+    def _needs_original_content(config: WriteConfig, mode: str, output_style: str) -> bool:
+        """Whether the write depends on the existing file content"""
+        # OVERWRITE + DEFAULT apply without backup just writes config.content. Non-empty
+        # content keeps has_changes truthful against the empty placeholder original;
+        # write_file has already ruled out identical content.
+        return not (
+            config.operation == WriteOperation.OVERWRITE and
+            mode.lower() == ExecutionMode.APPLY.value and
+            output_style.lower() == OutputStyle.DEFAULT.value and
+            not config.backup and
+            config.content
+        )
+
     def _is_content_identical(self, file_path: Union[str, Path], content: str, operation: str) -> bool:
         """Check if content would result in no changes"""
         file_path = Path(file_path)
@@ -408,66 +706,329 @@ class WriteEngine:
         if operation.lower() != "overwrite":
             return False
 
-        if not file_path.exists():
+        try:
+            st = file_path.stat()
+        except OSError:
             return False
+        file_size = st.st_size
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                existing_content = f.read()
-
             # Normalize line endings for comparison
-            existing_normalized = existing_content.replace('\r\n', '\n').replace('\r', '\n')
-            content_normalized = content.replace('\r\n', '\n').replace('\r', '\n')
+            expected = _normalize_newlines(content).strip()
+
+            # Decoded text is never longer than the file is in bytes
+            if file_size < len(expected):
+                return False
 
-            return existing_normalized.strip() == content_normalized.strip()
+            if file_size <= IDENTITY_CACHED_READ_BYTES:
+                # Read through the cache so the diff that follows reuses this read
+                return _read_file_cached(file_path, 'utf-8', st).strip() == expected
+            return self._file_matches_stripped(file_path, expected)
         except Exception:
             return False
 
-    def _create_backup(self, file_path: Path) -> Optional[Path]:
-        """Create backup of existing file"""
+    @staticmethod
+    def _file_matches_stripped(file_path: Path, expected: str, chunk_size: int = 64 * 1024) -> bool:
+        """Stream the file and compare its stripped text against expected, stopping at the first mismatch"""
+        pos = 0
+        leading = True
+
+        # Universal newlines apply the same \r\n / \r normalization as the content side
+        with open(file_path, 'r', encoding='utf-8') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return pos == len(expected)
+
+                if leading:
+                    chunk = chunk.lstrip()
+                    if not chunk:
+                        continue
+                    leading = False
+
+                if pos < len(expected):
+                    n = min(len(chunk), len(expected) - pos)
+                    if not expected.startswith(chunk[:n], pos):
+                        return False
+                    pos += n
+                    chunk = chunk[n:]
+
+                # Anything past the expected text may only be trailing whitespace
+                if chunk and not chunk.isspace():
+                    return False
+
+    def _create_backup(self, file_path: Path, link: bool = True) -> Optional[Path]:
+        """Create backup of existing file (a hard link only if the file will be replaced, not rewritten)"""
         if not file_path.exists():
             return None
 
         try:
-            backup_path = file_path.with_suffix(f"{file_path.suffix}.backup")
-            counter = 1
-            while backup_path.exists():
-                backup_path = file_path.with_suffix(f"{file_path.suffix}.backup.{counter}")
-                counter += 1
-
-            shutil.copy2(file_path, backup_path)
-            return backup_path
+            # os.link would link a symlink itself; back up the file it points to
+            source = os.path.realpath(file_path)
+            counter = 0
+            while True:
+                suffix = f"{file_path.suffix}.backup.{counter}" if counter else f"{file_path.suffix}.backup"
+                backup_path = file_path.with_suffix(suffix)
+                # Creation itself fails on a taken name: no exists() probe, no race
+                try:
+                    self._link_or_copy(source, backup_path, link)
+                    return backup_path
+                except FileExistsError:
+                    counter += 1
         except Exception as e:
             print(f"Warning: Failed to create backup: {e}")
             return None
 
+    @staticmethod
+    def _link_or_copy(source: str, backup_path: Path, link: bool = True):
+        """Populate a new backup_path from source, raising FileExistsError if it is taken"""
+        # When the new content is renamed over the original, a hard link keeps the old
+        # inode intact as the backup without copying any data
+        if link:
+            try:
+                os.link(source, backup_path)
+                return
+            except FileExistsError:
+                raise
+            except OSError:
+                pass  # e.g. cross-device or links unsupported on this filesystem
+
+        with open(source, 'rb') as src:
+            st = os.fstat(src.fileno())
+            # Create with the source's permission bits up front instead of a copystat pass
+            fd = os.open(backup_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, stat.S_IMODE(st.st_mode))
+            try:
+                try:
+                    # Only Linux sendfile accepts a regular file as output (shutil checks the same)
+                    if sys.platform.startswith('linux'):
+                        # Kernel-to-kernel copy, no user-space buffer
+                        offset = 0
+                        while offset < st.st_size:
+                            sent = os.sendfile(fd, src.fileno(), offset, st.st_size - offset)
+                            if not sent:
+                                break
+                            offset += sent
+                    else:
+                        with open(fd, 'wb', closefd=False) as dst:
+                            shutil.copyfileobj(src, dst)
+                finally:
+                    os.close(fd)
+                # Keep the original timestamps from the stat we already have
+                os.utime(backup_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            except BaseException:
+                # Don't leave a partial backup claiming the name
+                backup_path.unlink(missing_ok=True)
+                raise
+
+    @staticmethod
+    def _can_replace(target_path: Path) -> bool:
+        """Whether renaming a temp file over target_path is indistinguishable from rewriting it in place"""
+        target_path = Path(os.path.realpath(target_path))
+        try:
+            st = os.stat(target_path)
+        except FileNotFoundError:
+            return True
+        if st.st_nlink > 1:
+            return False  # Other names for the file would keep the old content
+        if hasattr(os, 'geteuid') and (st.st_uid != os.geteuid() or st.st_gid != os.getegid()):
+            return False  # The new inode would belong to us instead of the original owner/group
+        if hasattr(os, 'listxattr'):
+            try:
+                # xattrs and ACLs live on the inode; SELinux labels are reassigned on create
+                if any(name != 'security.selinux' for name in os.listxattr(target_path)):
+                    return False
+            except OSError:
+                pass
+        # The temp file needs a writable directory even when the file itself is writable
+        return os.access(target_path.parent, os.W_OK | os.X_OK)
+
+    @staticmethod
+    def _atomic_write(target_path: Path, chunks: List[str], encoding: str, direct: bool = False,
+                      in_place: bool = False):
+        """Write to a sibling temp file, then rename it over the target (or rewrite it in place)"""
+        if target_path.is_symlink():
+            # Replace the file the link points to, not the link itself
+            target_path = Path(os.path.realpath(target_path))
+
+        if in_place:
+            WriteEngine._write_chunks(target_path, chunks, encoding, direct=direct)
+            return
+
+        try:
+            fd, tmp_path = WriteEngine._create_temp(target_path)
+        except PermissionError as e:
+            # No temp file can be created: rewrite in place, unless other links
+            # (such as a hard-link backup) would then see the new content too
+            try:
+                linked = os.stat(target_path).st_nlink > 1
+            except FileNotFoundError:
+                raise e from None  # New file in an unwritable directory: report that
+            if linked:
+                raise
+            WriteEngine._write_chunks(target_path, chunks, encoding, direct=direct)
+            return
+
+        try:
+            try:
+                WriteEngine._write_chunks(tmp_path, chunks, encoding, direct=direct, fd=fd)
+                try:
+                    mode = stat.S_IMODE(os.stat(target_path).st_mode)
+                except FileNotFoundError:
+                    pass  # New file: keep the umask default mode
+                else:
+                    # Through the descriptor, so a name swapped in meanwhile can't redirect it
+                    if hasattr(os, 'fchmod'):
+                        os.fchmod(fd, mode)
+                    else:
+                        os.chmod(tmp_path, mode)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, target_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _create_temp(target_path: Path):
+        """Exclusively create a randomly named temp file next to target_path; returns (fd, path)"""
+        # O_EXCL never opens an existing name or follows a symlink planted there, and
+        # concurrent writers of the same target each get their own file
+        flags = (os.O_WRONLY | os.O_CREAT | os.O_EXCL |
+                 getattr(os, 'O_NOFOLLOW', 0) | getattr(os, 'O_BINARY', 0))
+        while True:
+            tmp_path = target_path.with_name(f".{target_path.name}.{secrets.token_hex(6)}.tmp")
+            try:
+                return os.open(tmp_path, flags, 0o666), tmp_path
+            except FileExistsError:
+                continue
+
+    @staticmethod
+    def _write_chunks(target_path: Path, chunks: List[str], encoding: str, direct: bool = False,
+                      fd: Optional[int] = None):
+        """Write content pieces without joining them first (scatter-gather where available)
+
+        A given fd is an open descriptor for target_path; it is written through and left open.
+        """
+        if not hasattr(os, 'writev'):
+            # Windows: text mode keeps the platform newline translation
+            with open(target_path if fd is None else fd, 'w', encoding=encoding,
+                      closefd=fd is None) as f:
+                f.writelines(chunks)
+                f.flush()
+                os.fsync(f.fileno())
+            return
+
+        # Incremental encoder emits a BOM at most once, as a text-mode file would
+        encoder = codecs.getincrementalencoder(encoding)()
+        buffers = [memoryview(encoder.encode(chunk)) for chunk in chunks]
+        buffers.append(memoryview(encoder.encode('', final=True)))
+        buffers = [b for b in buffers if b.nbytes]
+
+        owns_fd = fd is None
+        if owns_fd:
+            fd = os.open(target_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            if direct and hasattr(os, 'O_DIRECT') and fcntl is not None:
+                total = sum(b.nbytes for b in buffers)
+                if total > DIRECT_WRITE_THRESHOLD:
+                    try:
+                        WriteEngine._write_direct(fd, buffers, total)
+                        return
+                    except OSError:
+                        # e.g. tmpfs rejects O_DIRECT; rewrite through the page cache
+                        os.ftruncate(fd, 0)
+                        os.lseek(fd, 0, os.SEEK_SET)
+
+            # writev may write partially; resume from the first unwritten byte
+            i = 0
+            while i < len(buffers):
+                written = os.writev(fd, buffers[i:i + 1024])
+                while i < len(buffers) and written >= buffers[i].nbytes:
+                    written -= buffers[i].nbytes
+                    i += 1
+                if written:
+                    buffers[i] = buffers[i][written:]
+            os.fsync(fd)
+        finally:
+            if owns_fd:
+                os.close(fd)
+
+    @staticmethod
+    def _write_direct(fd: int, buffers: List[memoryview], total: int):
+        """Write with O_DIRECT (switched on for fd only meanwhile) through a page-aligned buffer, then fsync"""
+        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_DIRECT)
+        block = DIRECT_WRITE_BLOCK
+        staging = mmap.mmap(-1, block)  # Anonymous mappings are page aligned
+        try:
+            with memoryview(staging) as view:
+
+                def flush(size):
+                    # Release the slice even on error, or staging.close() hits a live export
+                    with view[:size] as chunk:
+                        if os.write(fd, chunk) != size:
+                            raise OSError("Short write with O_DIRECT")
+
+                filled = 0
+                for buf in buffers:
+                    pos = 0
+                    while pos < buf.nbytes:
+                        n = min(block - filled, buf.nbytes - pos)
+                        view[filled:filled + n] = buf[pos:pos + n]
+                        filled += n
+                        pos += n
+                        if filled == block:
+                            flush(block)
+                            filled = 0
+
+                if filled:
+                    # O_DIRECT only writes whole pages: pad the tail, then cut the file back
+                    padded = -(-filled // mmap.PAGESIZE) * mmap.PAGESIZE
+                    view[filled:padded] = bytes(padded - filled)
+                    flush(padded)
+                    os.ftruncate(fd, total)
+
+            os.fsync(fd)
+        finally:
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags)
+            staging.close()
+
     def _handle_preview(self, result: WriteResult, style: OutputStyle):
         """Handle preview mode output"""
+        # Collect everything and hand it to stdout in one writelines call
+        lines = []
         for file_result in result.file_results:
-            print(f"\n{'='*60}")
-            print(f"File: {file_result.file_path}")
+            lines.append(f"\n{'='*60}\n")
+            lines.append(f"File: {file_result.file_path}\n")
             if file_result.change:
-                print(f"Operation: {file_result.operation_type}")
-                print(f"Size: {file_result.change.content_size} bytes, {file_result.change.line_count} lines")
-            print(f"Mode: PREVIEW")
-            print('='*60)
+                lines.append(f"Operation: {file_result.operation_type}\n")
+                lines.append(f"Size: {file_result.change.content_size} bytes, {file_result.change.line_count} lines\n")
+            lines.append("Mode: PREVIEW\n")
+            lines.append('='*60 + '\n')
 
             if not file_result.has_change:
-                print("No changes to preview.")
+                lines.append("No changes to preview.\n")
                 continue
 
-            if style == OutputStyle.DEFAULT:
-                print(self.formatter.format_default(file_result))
-            elif style == OutputStyle.GIT_DIFF:
-                print(self.formatter.format_git_diff(file_result))
-            elif style == OutputStyle.GIT_CONFLICT:
-                print(self.formatter.format_git_conflict(file_result))
+            lines.extend(self.formatter.format_chunks(file_result, style))
+            lines.append('\n')
+        sys.stdout.writelines(lines)
 
     def _handle_apply(self, result: WriteResult, style: OutputStyle, output_file: Optional[Path]):
         """Handle apply mode output"""
+        # Status lines are buffered and written once, even if a write fails midway
+        messages = []
+        try:
+            self._apply_results(result, style, output_file, messages)
+        finally:
+            sys.stdout.writelines(messages)
+
+    def _apply_results(self, result: WriteResult, style: OutputStyle, output_file: Optional[Path],
+                       messages: List[str]):
+        """Write every changed file result, appending status lines to messages"""
         for file_result in result.file_results:
             if not file_result.has_change:
-                print(f"ℹ️  No changes needed for: {file_result.file_path}")
+                messages.append(f"ℹ️  No changes needed for: {file_result.file_path}\n")
                 file_result.success = True
                 continue
 
@@ -478,30 +1039,34 @@ class WriteEngine:
                 else:
                     target_path = file_result.file_path
 
+                # Decide before backing up: a hard-link backup itself raises the link count
+                in_place = not self._can_replace(target_path)
+
                 # Create backup if needed (only for DEFAULT style and same file)
                 if (result.config.backup and 
                     target_path.exists() and 
                     target_path == file_result.file_path and 
                     style == OutputStyle.DEFAULT):
-                    file_result.backup_path = self._create_backup(target_path)
+                    file_result.backup_path = self._create_backup(target_path, link=not in_place)
                     if file_result.backup_path:
-                        print(f"📦 Backup created: {file_result.backup_path}")
+                        messages.append(f"📦 Backup created: {file_result.backup_path}\n")
 
                 # Generate content based on style
-                if style == OutputStyle.DEFAULT:
-                    content = self.formatter.format_default(file_result)
-                elif style == OutputStyle.GIT_DIFF:
-                    content = self.formatter.format_git_diff(file_result)
-                elif style == OutputStyle.GIT_CONFLICT:
-                    content = self.formatter.format_git_conflict(file_result)
+                chunks = self.formatter.format_chunks(file_result, style)
 
                 # Create directories if needed
                 if result.config.create_dirs:
                     target_path.parent.mkdir(parents=True, exist_ok=True)
 
                 # Write to file
-                with open(target_path, 'w', encoding=result.config.encoding) as f:
-                    f.write(content)
+                self._atomic_write(
+                    target_path,
+                    chunks,
+                    result.config.encoding,
+                    direct=result.config.fast_large_write and not result.config.preserve_permissions,
+                    in_place=in_place
+                )
+                _invalidate_file_cache(target_path)
 
                 # Preserve permissions if requested (only for DEFAULT style)
                 if (result.config.preserve_permissions and 
@@ -514,12 +1079,12 @@ class WriteEngine:
                         pass  # Ignore permission copy errors
 
                 file_result.success = True
-                print(f"✅ Successfully {file_result.operation_type}: {target_path}")
+                messages.append(f"✅ Successfully {file_result.operation_type}: {target_path}\n")
 
             except Exception as e:
                 file_result.success = False
                 file_result.error_message = str(e)
-                print(f"❌ Error writing {file_result.file_path}: {e}")
+                messages.append(f"❌ Error writing {file_result.file_path}: {e}\n")
 
 
 def write_and_ask(
@@ -554,6 +1119,8 @@ def write_and_ask(
             - backup (bool): Create backup (default: True)
             - create_dirs (bool): Create parent directories (default: True)
             - preserve_permissions (bool): Preserve file permissions (default: True)
+            - fast_large_write (bool): Write content over 1MB with O_DIRECT on Linux;
+              ignored while preserve_permissions is set (default: False)
 
     Returns:
         Union[WriteResult, str]:
@@ -674,6 +1241,8 @@ def write_file(
             - backup (bool): Create backup (default: True)
             - create_dirs (bool): Create parent directories (default: True)
             - preserve_permissions (bool): Preserve file permissions (default: True)
+            - fast_large_write (bool): Write content over 1MB with O_DIRECT on Linux;
+              ignored while preserve_permissions is set (default: False)
 
     Returns:
         WriteResult: Results with operation status and metadata
@@ -785,15 +1354,17 @@ Examples:
 
     # If file and content parameters are provided, process the actual file
     if args.file and args.content is not None:
-        print(f"📝 Processing file: {args.file}")
-        print(f"Content: '{args.content}'")
-        print(f"Mode: {args.mode}")
-        print(f"Style: {args.style}")
-        print(f"Operation: {args.operation}")
-        print(f"Encoding: {args.encoding}")
-        print(f"Backup: {not args.no_backup}")
-        print(f"Create dirs: {not args.no_create_dirs}")
-        print(f"Preserve permissions: {not args.no_preserve_permissions}")
+        print("\n".join([
+            f"📝 Processing file: {args.file}",
+            f"Content: '{args.content}'",
+            f"Mode: {args.mode}",
+            f"Style: {args.style}",
+            f"Operation: {args.operation}",
+            f"Encoding: {args.encoding}",
+            f"Backup: {not args.no_backup}",
+            f"Create dirs: {not args.no_create_dirs}",
+            f"Preserve permissions: {not args.no_preserve_permissions}",
+        ]))
 
         # Process content (handle \n sequences)
         processed_content = args.content.replace('\\n', '\n')
@@ -817,17 +1388,19 @@ Examples:
                 **kwargs
             )
 
-            print(f"\n📊 Results:")
-            print(f"Files processed: {result.total_files_processed}")
-            print(f"Files changed: {result.total_files_changed}")
-            print(f"Files created: {result.total_files_created}")
-            print(f"Overall success: {result.success}")
-
+            report = [
+                f"\n📊 Results:",
+                f"Files processed: {result.total_files_processed}",
+                f"Files changed: {result.total_files_changed}",
+                f"Files created: {result.total_files_created}",
+                f"Overall success: {result.success}",
+            ]
             for file_result in result.file_results:
                 if file_result.backup_path:
-                    print(f"Backup: {file_result.backup_path}")
+                    report.append(f"Backup: {file_result.backup_path}")
                 if file_result.error_message:
-                    print(f"Error: {file_result.error_message}")
+                    report.append(f"Error: {file_result.error_message}")
+            print("\n".join(report))
 
         except Exception as e:
             print(f"❌ Error: {e}")
@@ -840,37 +1413,35 @@ Examples:
         # Create a test file
         test_content = "Original line 1\nOriginal line 2\nOriginal line 3"
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(test_content)
-            test_file = f.name
-
-        try:
-            print("=== Preview Mode (Default) ===")
-            write_file(test_file, "New content line 1\nNew content line 2", mode="preview")
+        # The directory takes the test file with it on exit, so it is written
+        # once and never reopened just to be deleted
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test_file = os.path.join(tmp_dir, 'demo.txt')
+            Path(test_file).write_text(test_content)
 
-            print("\n=== Preview Mode (Git Diff) ===")
-            write_file(test_file, "Modified content", mode="preview", output_style="git_diff")
+            try:
+                print("=== Preview Mode (Default) ===")
+                write_file(test_file, "New content line 1\nNew content line 2", mode="preview")
 
-            print("\n=== Preview Mode (Git Conflict) ===")
-            write_file(test_file, "Conflict content", mode="preview", output_style="git_conflict")
+                print("\n=== Preview Mode (Git Diff) ===")
+                write_file(test_file, "Modified content", mode="preview", output_style="git_diff")
 
-            print("\n=== Append Operation ===")
-            write_file(test_file, "\nAppended line", mode="preview", operation="append")
+                print("\n=== Preview Mode (Git Conflict) ===")
+                write_file(test_file, "Conflict content", mode="preview", output_style="git_conflict")
 
-            print("\n=== Prepend Operation ===")
-            write_file(test_file, "Prepended line\n", mode="preview", operation="prepend")
+                print("\n=== Append Operation ===")
+                write_file(test_file, "\nAppended line", mode="preview", operation="append")
 
-            print("\n=== Apply Mode (Create new file) ===")
-            result = write_file("demo_output.txt", "Demo content\nLine 2", 
-                              mode="apply", operation="create")
+                print("\n=== Prepend Operation ===")
+                write_file(test_file, "Prepended line\n", mode="preview", operation="prepend")
 
-            print(f"Success: {result.success}")
-            print(f"Files created: {result.total_files_created}")
+                print("\n=== Apply Mode (Create new file) ===")
+                result = write_file("demo_output.txt", "Demo content\nLine 2", 
+                                  mode="apply", operation="create")
 
-        finally:
-            # Cleanup
-            if os.path.exists(test_file):
-                os.unlink(test_file)
-            if os.path.exists("demo_output.txt"):
-                print("Cleaning up demo_output.txt")
-                os.unlink("demo_output.txt") 
\ No newline at end of file
+                print(f"Success: {result.success}\nFiles created: {result.total_files_created}")
+            finally:
+                # Cleanup
+                if os.path.exists("demo_output.txt"):
+                    print("Cleaning up demo_output.txt")
+                    os.unlink("demo_output.txt") 
\ No newline at end of file
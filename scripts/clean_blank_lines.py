@@ -1,28 +1,154 @@
 #!/usr/bin/env python3
 import argparse
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# The spaces/tabs of a line holding nothing else; a CRLF's carriage return is left alone
+_BLANK_LINE_RE = re.compile(rb"^[ \t]+(?=\r?$)", re.MULTILINE)
+_BLANK_LINE_TEXT_RE = re.compile(r"^[ \t]+(?=\r?$)", re.MULTILINE)
+
+# Below this size a single read() is cheaper than setting up a mapping
+MMAP_THRESHOLD = 64 * 1024
+
+# Keep Windows from translating line endings under os.read/os.write
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+# How much of a mapping to ask the kernel to start reading ahead of the scan
+READAHEAD_BYTES = 64 * 1024 * 1024
+
+# Like git, call a file binary if a NUL byte shows up near its start
+BINARY_SNIFF_BYTES = 8000
+
 def clean_blank_lines(content: str) -> str:
     """
     Remove tabs/spaces from lines that are otherwise blank.
     """
-    lines = content.split("\n")
-    cleaned_lines = [
-        "" if line.strip() == "" else line
-        for line in lines
-    ]
-    return "\n".join(cleaned_lines)
+    return _BLANK_LINE_TEXT_RE.sub("", content)
 
-def process_file(file_path: Path):
-    if not file_path.exists():
-        print(f"❌ File not found: {file_path}")
-        return
+def clean_blank_lines_bytes(data: bytes) -> bytes:
+    """
+    Byte-level counterpart of clean_blank_lines for UTF-8 (or any ASCII-compatible) data.
+    """
+    return _BLANK_LINE_RE.sub(b"", data)
 
-    original_content = file_path.read_text(encoding="utf-8")
-    cleaned_content = clean_blank_lines(original_content)
+def _advise_sequential(mm: mmap.mmap):
+    """
+    Hint that a mapping is about to be scanned front to back (no-op where unsupported).
+    """
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+        mm.madvise(mmap.MADV_WILLNEED, 0, min(len(mm), READAHEAD_BYTES))
+
+def _compact_blank_lines(mm: mmap.mmap, pos: int) -> int:
+    """
+    Squeeze whitespace-only lines out of a writable mapping from ``pos`` on.
 
-    file_path.write_text(cleaned_content, encoding="utf-8")
-    print(f"✅ Cleaned and saved: {file_path}")
+    Kept bytes are moved down over the removed ones, so no second copy of the
+    file is built; returns the length the file should be truncated to.
+    """
+    write = read = pos
+    for match in _BLANK_LINE_RE.finditer(mm, pos):
+        start, end = match.span()
+        mm.move(write, read, start - read)
+        write += start - read
+        read = end
+    mm.move(write, read, len(mm) - read)
+    return write + len(mm) - read
+
+def _collect_dir_files(root: str, paths: list, messages: list):
+    """
+    Append the regular files below ``root`` to ``paths``, skipping hidden entries
+    such as .git; unreadable directories get a status line in ``messages``.
+    """
+    # scandir hands back the entry type with the listing, so no per-file stat
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        paths.append(Path(entry.path))
+        except OSError as e:
+            messages.append(f"❌ Failed to read directory {directory}: {e}")
+
+def process_file(file_path: Path) -> str:
+    """
+    Clean one file in place and return a status line for it.
+    """
+    # Report per file so one bad path doesn't abort the batch and its report
+    try:
+        return _clean_file(file_path)
+    except FileNotFoundError:
+        return f"❌ File not found: {file_path}"
+    except OSError as e:
+        return f"❌ Failed to clean {file_path}: {e}"
+
+def _clean_file(file_path: Path) -> str:
+    # Scan read-only: an already clean file is never opened for writing
+    fd = os.open(file_path, os.O_RDONLY | _O_BINARY)
+    try:
+        # Work on raw UTF-8 bytes: space, tab and newline never occur
+        # inside a multi-byte sequence, so nothing needs decoding
+        size = os.fstat(fd).st_size
+        cleaned = None
+        first = None
+        binary = False
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                _advise_sequential(mm)
+                binary = mm.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1
+                match = None if binary else _BLANK_LINE_RE.search(mm)
+                if match:
+                    first = match.start()
+        elif size:
+            data = os.read(fd, size)
+            binary = data.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1
+            if not binary:
+                # One pass: subn reports whether anything matched, so the clean
+                # prefix is not scanned twice as it was with search() + sub()
+                cleaned, count = _BLANK_LINE_RE.subn(b"", data)
+                if not count:
+                    cleaned = None
+    finally:
+        os.close(fd)
+
+    if binary:
+        return f"⚠️ Skipped binary file: {file_path}"
+
+    if first is not None:
+        # Large files are compacted in place rather than copied out and rewritten
+        fd = os.open(file_path, os.O_RDWR | _O_BINARY)
+        try:
+            with mmap.mmap(fd, 0) as mm:
+                _advise_sequential(mm)
+                new_size = _compact_blank_lines(mm, first)
+            # Truncate only once the mapping is gone (Windows refuses otherwise)
+            os.ftruncate(fd, new_size)
+        finally:
+            os.close(fd)
+        return f"✅ Cleaned and saved: {file_path}"
+
+    if cleaned is None:
+        return f"➖ Already clean: {file_path}"
+
+    fd = os.open(file_path, os.O_WRONLY | os.O_TRUNC | _O_BINARY)
+    try:
+        # Hand the whole buffer to one write(); the loop only covers short writes
+        view = memoryview(cleaned)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    return f"✅ Cleaned and saved: {file_path}"
 
 def main():
     parser = argparse.ArgumentParser(
@@ -30,14 +156,54 @@ def main():
     )
     parser.add_argument(
         "files",
-        nargs="+",
+        nargs="*",
         help="One or more file paths to process"
     )
+    parser.add_argument(
+        "-d", "--dir",
+        dest="dirs",
+        metavar="DIR",
+        action="append",
+        default=[],
+        help="Process every non-hidden file below this directory (repeatable)"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Number of files to process concurrently (default: based on CPU count)"
+    )
 
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if not args.files and not args.dirs:
+        parser.error("no files or directories given")
+
+    paths = [Path(file) for file in args.files]
+    messages = []
+    for directory in args.dirs:
+        if not os.path.isdir(directory):
+            parser.error(f"not a directory: {directory}")
+        _collect_dir_files(directory, paths, messages)
+    # The same file reached twice (-d src plus src/x.py, nested -d, symlinks)
+    # must not be cleaned by two workers at once; keep its first spelling
+    unique = {}
+    for path in paths:
+        unique.setdefault(os.path.realpath(path), path)
+    paths = list(unique.values())
+    if not paths and not messages:
+        return
+
+    if args.jobs == 1 or len(paths) <= 1:
+        messages.extend(process_file(path) for path in paths)
+    else:
+        # Files are independent and mostly I/O bound, so threads are enough
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            messages.extend(executor.map(process_file, paths))
 
-    for file in args.files:
-        process_file(Path(file))
+    # One write for the whole report instead of a print per file
+    sys.stdout.write("\n".join(messages) + "\n")
 
 if __name__ == "__main__":
     main()